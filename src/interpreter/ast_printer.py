@@ -1,7 +1,6 @@
 from parser.expr import (
     Expr,
     Binary,
-    Grouping,
     Unary,
     Literal,
     Visitor as ExprVisitor,
@@ -17,9 +16,6 @@ class AstPrinter(ExprVisitor):
             f"({expr.operator.lexeme} {self.print(expr.left)} {self.print(expr.right)})"
         )
 
-    def visit_grouping_expr(self, expr: Grouping):
-        return f"(group {self.print(expr.expression)})"
-
     def visit_literal_expr(self, expr: Literal):
         return str(expr.value) if expr.value else "nil"
 
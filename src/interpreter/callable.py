@@ -1,22 +1,31 @@
-from abc import ABC, abstractmethod
 from time import time_ns
+from typing import List
 
 from interpreter.environment import Environment
-from interpreter.error import Return as ReturnError
 from parser.stmt import Function
 
 
-class LoxCallable(ABC):
-    @abstractmethod
-    def arity(self) -> int:
-        pass
+class LoxCallable:
+    __slots__ = ()
 
-    @abstractmethod
-    def call(self, interpreter, arguments):
-        pass
+    def arity(self) -> int: ...
+
+    def call(self, interpreter, arguments): ...
+
+    # Fixed-arity entry points, so common calls skip building an argument list
+    def call0(self, interpreter):
+        return self.call(interpreter, [])
+
+    def call1(self, interpreter, a0):
+        return self.call(interpreter, [a0])
+
+    def call2(self, interpreter, a0, a1):
+        return self.call(interpreter, [a0, a1])
 
 
 class Clock(LoxCallable):
+    __slots__ = ()
+
     def arity(self) -> int:
         return 0
 
@@ -28,22 +37,62 @@ class Clock(LoxCallable):
 
 
 class LoxFunction(LoxCallable):
+    __slots__ = ("declaration", "closure", "pooled", "pool")
+
     def __init__(self, declaration: Function, closure: Environment):
         self.declaration = declaration
         self.closure = closure
+        # A call's environment can only outlive it if a closure captures it,
+        # so functions that declare no inner functions recycle theirs.
+        self.pooled = not declaration.captures_environment
+        self.pool: List[Environment] = []
 
     def arity(self) -> int:
         return len(self.declaration.params)
 
-    def call(self, interpreter, arguments):
-        environment = Environment(self.closure)
-        for i in range(len(self.declaration.params)):
-            environment.define(self.declaration.params[i].lexeme, arguments[i])
+    def new_environment(self) -> Environment:
+        if self.pool:
+            return self.pool.pop()
+        return Environment(self.closure, self.declaration.n_locals)
 
+    def run(self, interpreter, environment: Environment):
+        """Execute the body in `environment` and hand back what it returned."""
         try:
             interpreter.execute_block(self.declaration.body, environment)
-        except ReturnError as e:
-            return e.value
+        finally:
+            if self.pooled:
+                # Fresh slots, so that an idle pooled environment does not keep
+                # the last call's values alive
+                environment.slots = [None] * self.declaration.n_locals
+                self.pool.append(environment)
+        value = interpreter.return_value
+        interpreter.returning = False
+        interpreter.return_value = None
+        return value
+
+    def call(self, interpreter, arguments):
+        environment = self.new_environment()
+        slots = environment.slots
+        for i in range(len(arguments)):
+            slots[i] = arguments[i]
+
+        return self.run(interpreter, environment)
+
+    def call0(self, interpreter):
+        environment = self.new_environment()
+        return self.run(interpreter, environment)
+
+    def call1(self, interpreter, a0):
+        environment = self.new_environment()
+        environment.slots[0] = a0
+        return self.run(interpreter, environment)
+
+    def call2(self, interpreter, a0, a1):
+        environment = self.new_environment()
+        slots = environment.slots
+        slots[0] = a0
+        slots[1] = a1
+        return self.run(interpreter, environment)
 
     def __str__(self):
         return f"<fn {self.declaration.name.lexeme}>"
@@ -1,31 +1,54 @@
-from typing import Dict
+from typing import Dict, List, Tuple
 from scanner import Token
 from interpreter.error import RuntimeError
 
+# Stands in for a missing name, since None is a valid value (nil)
+MISSING = object()
+
 
 class Environment:
-    def __init__(self, enclosing: "Environment" = None):
+    """
+    Globals live in the `values` dict, keyed by name.
+    Locals live in `slots`, indexed by the slot the resolver assigned to them.
+    `version` is bumped on every write to `values` so lookups can be cached.
+    `scope_chain` holds every enclosing environment, nearest first, so reaching
+    an ancestor is an index rather than a walk. It leaves out the environment
+    itself to avoid a reference cycle per environment.
+    """
+
+    __slots__ = ("enclosing", "scope_chain", "values", "slots", "version")
+
+    def __init__(self, enclosing: "Environment" = None, size: int = 0):
         self.enclosing = enclosing
+        self.scope_chain: Tuple["Environment", ...] = (
+            (enclosing,) + enclosing.scope_chain if enclosing else ()
+        )
         self.values: Dict[str, object] = dict()
+        self.slots: List[object] = [None] * size
+        self.version = 0
 
     def define(self, name: str, value: object):
         self.values[name] = value
+        self.version += 1
 
     def ancestor(self, distance: int):
-        environment = self
-        for _ in range(distance):
-            environment = environment.enclosing
-        return environment
+        return self.scope_chain[distance - 1] if distance else self
 
-    def get_at(self, distance: int, name: str):
-        return self.ancestor(distance).values[name]
+    def get_at(self, distance: int, slot: int):
+        if distance:
+            return self.scope_chain[distance - 1].slots[slot]
+        return self.slots[slot]
 
-    def assign_at(self, distance: int, name: Token, value: object):
-        self.ancestor(distance).values[name.lexeme] = value
+    def assign_at(self, distance: int, slot: int, value: object):
+        if distance:
+            self.scope_chain[distance - 1].slots[slot] = value
+        else:
+            self.slots[slot] = value
 
     def get(self, name: Token):
-        if name.lexeme in self.values:
-            return self.values[name.lexeme]
+        value = self.values.get(name.lexeme, MISSING)
+        if value is not MISSING:
+            return value
         if self.enclosing:
             return self.enclosing.get(name)
         raise RuntimeError(name, f"Undefined Variable '{name.lexeme}'.")
@@ -33,6 +56,7 @@ class Environment:
     def assign(self, name: Token, value: object):
         if name.lexeme in self.values:
             self.values[name.lexeme] = value
+            self.version += 1
             return
         if self.enclosing:
             self.enclosing.assign(name, value)
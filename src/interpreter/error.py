@@ -2,13 +2,12 @@ from scanner import Token
 
 
 class RuntimeError(Exception):
+    # Exception.__init__ is skipped: the message is only read when reported
+    __slots__ = ("token", "message")
+
     def __init__(self, token: Token, message: str):
         self.token = token
         self.message = message
-        super().__init__(message)
-
 
-class Return(RuntimeError):
-    def __init__(self, value):
-        self.value = value
-        super().__init__(None, None)
+    def __str__(self):
+        return self.message
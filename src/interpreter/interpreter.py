@@ -1,15 +1,16 @@
-from typing import List
+import operator
+from typing import Dict, List, Tuple
 from interpreter.callable import Clock, LoxCallable, LoxFunction
 from scanner import Token, TokenType
 from parser.expr import (
     Call,
     Expr,
     Binary,
-    Grouping,
     Unary,
     Literal,
     Assign,
     Logical,
+    Variable,
     Visitor as ExprVisitor,
 )
 from parser.stmt import (
@@ -25,7 +26,12 @@ from parser.stmt import (
     Visitor as StmtVisitor,
 )
 from interpreter.environment import Environment
-from interpreter.error import Return as ReturnError, RuntimeError
+from interpreter.error import RuntimeError
+
+# Whole floats up to this size print the same digits through int's formatter
+MAX_EXACT_INT = 2**53
+# Operators whose result is always a number
+ARITHMETIC_TOKENS = frozenset((TokenType.MINUS, TokenType.SLASH, TokenType.STAR))
 
 
 class Interpreter(ExprVisitor, StmtVisitor):
@@ -34,20 +40,39 @@ class Interpreter(ExprVisitor, StmtVisitor):
         self.globals = Environment()
         self.environment = self.globals
         self.globals.define("clock", Clock())
-        self.locals = {}
+        # Pinned calls currently caching a callee, by the global they name.
+        # A call registers when it caches and is dropped when it is unpinned.
+        self.pinned_calls: Dict[str, List[Call]] = {}
+        # Set by a return statement; every statement loop stops when it sees
+        # `returning`, and the function being called picks up `return_value`.
+        self.returning = False
+        self.return_value = None
 
     def interpret(self, statements: List[Stmt]):
+        execute = self.execute
         try:
             for statement in statements:
-                self.execute(statement)
+                execute(statement)
         except RuntimeError as e:
             self.pylox.runtime_error(e)
-            return None
+        finally:
+            # Calls from this run that never execute again must not stay
+            # registered; live ones register again when they next cache
+            for name in list(self.pinned_calls):
+                self.unpin(name)
 
     def stringify(self, value: object):
         if value is None:
             return "nil"
-        if isinstance(value, float):
+        if value.__class__ is float:
+            # Whole numbers print through int's formatter; zero is left to
+            # str so that -0.0 keeps its sign.
+            if (
+                value.is_integer()
+                and value
+                and -MAX_EXACT_INT <= value <= MAX_EXACT_INT
+            ):
+                return str(int(value))
             text = str(value)
             if text.endswith(".0"):
                 text = text[:-2]
@@ -55,156 +80,551 @@ class Interpreter(ExprVisitor, StmtVisitor):
         return str(value)
 
     def evaluate(self, expr: Expr):
-        return expr.accept(self)
+        return expr.eval(self, expr)
 
     def execute(self, stmt: Stmt):
-        return stmt.accept(self)
+        return stmt.execute(self, stmt)
+
+    def resolve(self, expr: Expr, depth: int, slot: int):
+        expr.depth = depth
+        expr.slot = slot
+
+    def infer_number_locals(self, values: List[Tuple[Var, Expr]]):
+        """
+        Mark the local Vars that only ever hold numbers, given every value
+        assigned to them. Each starts out assumed to and loses that as soon as
+        one of its values might be something else, until nothing changes.
+        """
+        for declaration, _ in values:
+            declaration.number_valued = True
+        changed = True
+        while changed:
+            changed = False
+            for declaration, value in values:
+                if declaration.number_valued and not is_number_valued(value):
+                    declaration.number_valued = False
+                    changed = True
+
+    def pin(self, expr: Call):
+        """
+        Let a call to a global function remember its callee.
+        The cached callee is dropped whenever that global is written.
+        """
+        expr.pinned = True
 
-    def resolve(self, expr: Expr, depth: int):
-        self.locals[expr] = depth
+    def unpin(self, name: str):
+        for call in self.pinned_calls.pop(name, ()):
+            call.resolved_callee = None
 
-    def execute_block(self, statements: List[Stmt], environment: Environment):
+    def specialize(self, expr: Expr):
+        """
+        Bind the function that evaluates this node ahead of time.
+        Operators get a function for their token type, so evaluating them
+        skips both the visitor's double dispatch and the operator checks.
+        """
+        if isinstance(expr, Binary):
+            expr.eval = self.binary_evaluators[expr.op_type]
+            number_operator = self.number_operators.get(expr.op_type)
+            if number_operator and is_number_literal(expr.right):
+                expr.number_operator = number_operator
+                expr.eval = Interpreter.eval_number_constant_right
+            elif number_operator and is_number_literal(expr.left):
+                expr.number_operator = number_operator
+                expr.eval = Interpreter.eval_number_constant_left
+            elif (
+                number_operator
+                and is_number_valued(expr.left)
+                and is_number_valued(expr.right)
+            ):
+                expr.eval = self.number_evaluators[expr.op_type]
+        elif isinstance(expr, Unary):
+            expr.eval = self.unary_evaluators[expr.op_type]
+        elif isinstance(expr, Logical) and isinstance(expr.right, Literal):
+            expr.eval = self.logical_literal_evaluators[expr.op_type]
+        elif isinstance(expr, Logical):
+            expr.eval = self.logical_evaluators[expr.op_type]
+        elif isinstance(expr, Variable):
+            if expr.depth == 0:
+                expr.eval = Interpreter.eval_local
+            elif expr.depth > 0:
+                expr.eval = Interpreter.eval_enclosing
+            else:
+                expr.eval = Interpreter.eval_global
+        elif isinstance(expr, Assign) and expr.depth == 0:
+            expr.eval = Interpreter.eval_assign_local
+        elif isinstance(expr, Call) and len(expr.arguments) in self.call_evaluators:
+            expr.eval = self.call_evaluators[len(expr.arguments)]
+        else:
+            expr.eval = self.evaluators[type(expr)]
+
+    def specialize_stmt(self, stmt: Stmt):
+        """Bind the function that executes this statement ahead of time."""
+        if isinstance(stmt, Block) and not stmt.n_locals:
+            stmt.execute = Interpreter.execute_unscoped_block
+        elif isinstance(stmt, Block) and not stmt.captures_environment:
+            stmt.execute = Interpreter.execute_pooled_block
+        else:
+            stmt.execute = self.executors[type(stmt)]
+
+    def execute_block(self, statements: Tuple[Stmt, ...], environment: Environment):
         previous = self.environment
         try:
             self.environment = environment
             for statement in statements:
-                self.execute(statement)
+                statement.execute(self, statement)
+                if self.returning:
+                    break
         finally:
             self.environment = previous
 
     def visit_block_stmt(self, stmt: Block):
-        self.execute_block(stmt.statements, Environment(self.environment))
+        self.execute_block(
+            stmt.statements, Environment(self.environment, stmt.n_locals)
+        )
+
+    def execute_unscoped_block(self, stmt: Block):
+        """A block that declares nothing runs in the enclosing environment."""
+        for statement in stmt.statements:
+            statement.execute(self, statement)
+            if self.returning:
+                break
+
+    def execute_pooled_block(self, stmt: Block):
+        """
+        A block no closure can capture reuses the environment of its last
+        run, as long as that run had the same enclosing environment.
+        """
+        pool = stmt.pool
+        enclosing = self.environment
+        environment = pool.pop() if pool else None
+        if environment is None or environment.enclosing is not enclosing:
+            environment = Environment(enclosing, stmt.n_locals)
+        self.execute_block(stmt.statements, environment)
+        # Fresh slots, so that the pool does not keep this run's values alive.
+        # The environment still holds on to `enclosing` until the block runs
+        # again; that reference is what lets the next run reuse it.
+        environment.slots = [None] * stmt.n_locals
+        pool.append(environment)
 
     def visit_expression_stmt(self, stmt: Expression):
-        self.evaluate(stmt.expression)
+        expression = stmt.expression
+        expression.eval(self, expression)
 
     def visit_function_stmt(self, stmt: Function):
         function = LoxFunction(stmt, self.environment)
-        self.environment.define(stmt.name.lexeme, function)
+        self.declare(stmt, function)
 
     def visit_print_stmt(self, stmt: Print):
-        value = self.evaluate(stmt.expression)
-        print(self.stringify(value))
+        expression = stmt.expression
+        print(self.stringify(expression.eval(self, expression)))
 
     def visit_return_stmt(self, stmt: Return):
-        value = None
-        if stmt.value:
-            value = self.evaluate(stmt.value)
-        raise ReturnError(value)
+        value = stmt.value
+        if value is not None:
+            value = value.eval(self, value)
+        self.return_value = value
+        self.returning = True
 
     def visit_var_stmt(self, stmt: Var):
-        value = None
-        if stmt.initializer:
-            value = self.evaluate(stmt.initializer)
-        self.environment.define(stmt.name.lexeme, value)
+        value = stmt.initializer
+        if value is not None:
+            value = value.eval(self, value)
+        self.declare(stmt, value)
+
+    def declare(self, stmt: Stmt, value: object):
+        if stmt.depth >= 0:
+            self.environment.slots[stmt.slot] = value
+        else:
+            self.globals.define(stmt.name.lexeme, value)
+            self.unpin(stmt.name.lexeme)
 
     def visit_while_stmt(self, stmt: While):
-        while self.evaluate(stmt.condition):
-            self.execute(stmt.body)
+        condition, body = stmt.condition, stmt.body
+        evaluate, execute = condition.eval, body.execute
+        while evaluate(self, condition):
+            execute(self, body)
+            if self.returning:
+                break
 
     def visit_if_stmt(self, stmt: If):
-        if self.evaluate(stmt.condition):
-            self.execute(stmt.then_branch)
-        elif stmt.else_branch:
-            self.execute(stmt.else_branch)
+        condition = stmt.condition
+        if condition.eval(self, condition):
+            branch = stmt.then_branch
+        else:
+            branch = stmt.else_branch
+            if branch is None:
+                return
+        branch.execute(self, branch)
 
     def visit_assign_expr(self, expr: Assign):
-        value = self.evaluate(expr.value)
-        if expr.name in self.locals:
-            distance = self.locals[expr.name]
-            self.environment.assign_at(distance, expr.name, value)
+        value = expr.value
+        value = value.eval(self, value)
+        distance = expr.depth
+        if distance >= 0:
+            self.environment.assign_at(distance, expr.slot, value)
         else:
             self.globals.assign(expr.name, value)
+            self.unpin(expr.name.lexeme)
         return value
 
-    def visit_variable_expr(self, expr):
-        return self.look_up_variable(expr.name, expr)
+    def eval_assign_local(self, expr: Assign):
+        value = expr.value
+        value = value.eval(self, value)
+        self.environment.slots[expr.slot] = value
+        return value
+
+    def visit_variable_expr(self, expr: Variable):
+        return self.look_up_variable(expr)
+
+    def look_up_variable(self, expr: Variable):
+        distance = expr.depth
+        if distance >= 0:
+            return self.environment.get_at(distance, expr.slot)
+        return self.eval_global(expr)
+
+    def eval_local(self, expr: Variable):
+        """A variable declared in the innermost scope."""
+        return self.environment.slots[expr.slot]
+
+    def eval_enclosing(self, expr: Variable):
+        """A variable declared in a scope enclosing the innermost one."""
+        return self.environment.scope_chain[expr.depth - 1].slots[expr.slot]
 
-    def look_up_variable(self, name: Token, expr: Expr):
-        if expr in self.locals:
-            distance = self.locals[expr]
-            return self.environment.get_at(distance, name.lexeme)
-        return self.globals.get(name)
+    def eval_global(self, expr: Variable):
+        if expr.cached_version == self.globals.version:
+            return expr.cached_value
+        value = self.globals.get(expr.name)
+        expr.cached_version = self.globals.version
+        expr.cached_value = value
+        return value
 
     def visit_literal_expr(self, expr: Literal):
         return expr.value
 
     def visit_logical_expr(self, expr: Logical):
-        left = self.evaluate(expr.left)
-        if expr.operator.type == TokenType.OR:
-            if left:
-                return left
-        else:
-            if not left:
-                return left
-        return self.evaluate(expr.right)
-
-    def visit_grouping_expr(self, expr: Grouping):
-        return self.evaluate(expr.expression)
+        return self.logical_evaluators[expr.op_type](self, expr)
 
     def visit_unary_expr(self, expr: Unary):
-        right = self.evaluate(expr.right)
-        if expr.operator.type == TokenType.MINUS:
-            self.check_number_operand(expr.operator, right)
-            return -right
-        if expr.operator.type == TokenType.BANG:
-            return not right
+        return self.unary_evaluators[expr.op_type](self, expr)
 
     def visit_binary_expr(self, expr: Binary):
-        left = self.evaluate(expr.left)
-        right = self.evaluate(expr.right)
-        if expr.operator.type == TokenType.MINUS:
-            self.check_number_operands(expr.operator, left, right)
+        return self.binary_evaluators[expr.op_type](self, expr)
+
+    def visit_call_expr(self, expr: Call):
+        callee = expr.resolved_callee or self.evaluate_callee(expr)
+        evaluate = self.evaluate
+        arguments = []
+        for argument in expr.arguments:
+            arguments.append(evaluate(argument))
+        self.check_callable(expr.paren, callee, len(arguments))
+        return callee.call(self, arguments)
+
+    def evaluate_callee(self, expr: Call):
+        callee = self.evaluate(expr.callee)
+        if expr.pinned:
+            expr.resolved_callee = callee
+            self.pinned_calls.setdefault(expr.callee.name.lexeme, []).append(expr)
+        return callee
+
+    def eval_call0(self, expr: Call):
+        callee = expr.resolved_callee or self.evaluate_callee(expr)
+        self.check_callable(expr.paren, callee, 0)
+        return callee.call0(self)
+
+    def eval_call1(self, expr: Call):
+        callee = expr.resolved_callee or self.evaluate_callee(expr)
+        (a0,) = expr.arguments
+        a0 = a0.eval(self, a0)
+        self.check_callable(expr.paren, callee, 1)
+        return callee.call1(self, a0)
+
+    def eval_call2(self, expr: Call):
+        callee = expr.resolved_callee or self.evaluate_callee(expr)
+        a0, a1 = expr.arguments
+        a0 = a0.eval(self, a0)
+        a1 = a1.eval(self, a1)
+        self.check_callable(expr.paren, callee, 2)
+        return callee.call2(self, a0, a1)
+
+    def eval_number_constant_right(self, expr: Binary):
+        """Arithmetic or comparison whose right operand is a number literal."""
+        left = expr.left
+        left = left.eval(self, left)
+        if left.__class__ is not float:
+            self.raise_number_operands_error(expr)
+        return expr.number_operator(left, expr.right.value)
+
+    def eval_number_constant_left(self, expr: Binary):
+        """Arithmetic or comparison whose left operand is a number literal."""
+        right = expr.right
+        right = right.eval(self, right)
+        if right.__class__ is not float:
+            self.raise_number_operands_error(expr)
+        return expr.number_operator(expr.left.value, right)
+
+    # Arithmetic and comparisons whose operands can only produce numbers,
+    # so the operand checks are left out
+    def eval_numbers_add(self, expr: Binary):
+        left, right = expr.left, expr.right
+        return left.eval(self, left) + right.eval(self, right)
+
+    def eval_numbers_subtract(self, expr: Binary):
+        left, right = expr.left, expr.right
+        return left.eval(self, left) - right.eval(self, right)
+
+    def eval_numbers_multiply(self, expr: Binary):
+        left, right = expr.left, expr.right
+        return left.eval(self, left) * right.eval(self, right)
+
+    def eval_numbers_divide(self, expr: Binary):
+        left, right = expr.left, expr.right
+        return left.eval(self, left) / right.eval(self, right)
+
+    def eval_numbers_greater(self, expr: Binary):
+        left, right = expr.left, expr.right
+        return left.eval(self, left) > right.eval(self, right)
+
+    def eval_numbers_greater_equal(self, expr: Binary):
+        left, right = expr.left, expr.right
+        return left.eval(self, left) >= right.eval(self, right)
+
+    def eval_numbers_less(self, expr: Binary):
+        left, right = expr.left, expr.right
+        return left.eval(self, left) < right.eval(self, right)
+
+    def eval_numbers_less_equal(self, expr: Binary):
+        left, right = expr.left, expr.right
+        return left.eval(self, left) <= right.eval(self, right)
+
+    def eval_negate(self, expr: Unary):
+        right = expr.right
+        right = right.eval(self, right)
+        if right.__class__ is float:
+            return -right
+        raise RuntimeError(expr.operator, "Operand must be a number.")
+
+    def eval_not(self, expr: Unary):
+        right = expr.right
+        return not right.eval(self, right)
+
+    def eval_or(self, expr: Logical):
+        left = expr.left
+        left = left.eval(self, left)
+        if left:
+            return left
+        right = expr.right
+        return right.eval(self, right)
+
+    def eval_and(self, expr: Logical):
+        left = expr.left
+        left = left.eval(self, left)
+        if not left:
+            return left
+        right = expr.right
+        return right.eval(self, right)
+
+    def eval_or_literal(self, expr: Logical):
+        left = expr.left
+        return left.eval(self, left) or expr.right.value
+
+    def eval_and_literal(self, expr: Logical):
+        left = expr.left
+        return left.eval(self, left) and expr.right.value
+
+    def eval_subtract(self, expr: Binary):
+        left, right = expr.left, expr.right
+        left, right = left.eval(self, left), right.eval(self, right)
+        if left.__class__ is float and right.__class__ is float:
             return left - right
-        if expr.operator.type == TokenType.PLUS:
-            if isinstance(left, float) and isinstance(right, float):
-                return left + right
-            if isinstance(left, str) and isinstance(right, str):
-                return left + right
-            raise RuntimeError(
-                expr.operator, "Operands must be two numbers or two strings."
-            )
-        if expr.operator.type == TokenType.SLASH:
-            self.check_number_operands(expr.operator, left, right)
+        self.raise_number_operands_error(expr)
+
+    def eval_add_first(self, expr: Binary):
+        """
+        First run of a + whose operand types are not known ahead of time.
+        The node is rebound to the handler that tests for what it saw first,
+        which is what the site most likely sees on every later run.
+        """
+        value = self.eval_add(expr)
+        if value.__class__ is str:
+            expr.eval = Interpreter.eval_add_strings
+        else:
+            expr.eval = Interpreter.eval_add
+        return value
+
+    def eval_add(self, expr: Binary):
+        left, right = expr.left, expr.right
+        left, right = left.eval(self, left), right.eval(self, right)
+        if left.__class__ is float and right.__class__ is float:
+            return left + right
+        if isinstance(left, str) and isinstance(right, str):
+            return left + right
+        raise RuntimeError(
+            expr.operator, "Operands must be two numbers or two strings."
+        )
+
+    def eval_add_strings(self, expr: Binary):
+        left, right = expr.left, expr.right
+        left, right = left.eval(self, left), right.eval(self, right)
+        if left.__class__ is str and right.__class__ is str:
+            return left + right
+        if left.__class__ is float and right.__class__ is float:
+            return left + right
+        raise RuntimeError(
+            expr.operator, "Operands must be two numbers or two strings."
+        )
+
+    def eval_divide(self, expr: Binary):
+        left, right = expr.left, expr.right
+        left, right = left.eval(self, left), right.eval(self, right)
+        if left.__class__ is float and right.__class__ is float:
             return left / right
-        if expr.operator.type == TokenType.STAR:
-            self.check_number_operands(expr.operator, left, right)
+        self.raise_number_operands_error(expr)
+
+    def eval_multiply(self, expr: Binary):
+        left, right = expr.left, expr.right
+        left, right = left.eval(self, left), right.eval(self, right)
+        if left.__class__ is float and right.__class__ is float:
             return left * right
-        if expr.operator.type == TokenType.GREATER:
-            self.check_number_operands(expr.operator, left, right)
+        self.raise_number_operands_error(expr)
+
+    def eval_greater(self, expr: Binary):
+        left, right = expr.left, expr.right
+        left, right = left.eval(self, left), right.eval(self, right)
+        if left.__class__ is float and right.__class__ is float:
             return left > right
-        if expr.operator.type == TokenType.GREATER_EQUAL:
-            self.check_number_operands(expr.operator, left, right)
+        self.raise_number_operands_error(expr)
+
+    def eval_greater_equal(self, expr: Binary):
+        left, right = expr.left, expr.right
+        left, right = left.eval(self, left), right.eval(self, right)
+        if left.__class__ is float and right.__class__ is float:
             return left >= right
-        if expr.operator.type == TokenType.LESS:
-            self.check_number_operands(expr.operator, left, right)
+        self.raise_number_operands_error(expr)
+
+    def eval_less(self, expr: Binary):
+        left, right = expr.left, expr.right
+        left, right = left.eval(self, left), right.eval(self, right)
+        if left.__class__ is float and right.__class__ is float:
             return left < right
-        if expr.operator.type == TokenType.LESS_EQUAL:
-            self.check_number_operands(expr.operator, left, right)
+        self.raise_number_operands_error(expr)
+
+    def eval_less_equal(self, expr: Binary):
+        left, right = expr.left, expr.right
+        left, right = left.eval(self, left), right.eval(self, right)
+        if left.__class__ is float and right.__class__ is float:
             return left <= right
-        if expr.operator.type == TokenType.BANG_EQUAL:
-            return left != right
-        if expr.operator.type == TokenType.EQUAL_EQUAL:
-            return left == right
+        self.raise_number_operands_error(expr)
 
-    def visit_call_expr(self, expr: Call):
-        callee = self.evaluate(expr.callee)
-        arguments = [self.evaluate(arg) for arg in expr.arguments]
+    def eval_not_equal(self, expr: Binary):
+        left, right = expr.left, expr.right
+        return left.eval(self, left) != right.eval(self, right)
+
+    def eval_equal(self, expr: Binary):
+        left, right = expr.left, expr.right
+        return left.eval(self, left) == right.eval(self, right)
+
+    executors = {
+        Expression: visit_expression_stmt,
+        Print: visit_print_stmt,
+        Var: visit_var_stmt,
+        Block: visit_block_stmt,
+        If: visit_if_stmt,
+        While: visit_while_stmt,
+        Function: visit_function_stmt,
+        Return: visit_return_stmt,
+    }
+    number_operators = {
+        TokenType.MINUS: operator.sub,
+        TokenType.PLUS: operator.add,
+        TokenType.SLASH: operator.truediv,
+        TokenType.STAR: operator.mul,
+        TokenType.GREATER: operator.gt,
+        TokenType.GREATER_EQUAL: operator.ge,
+        TokenType.LESS: operator.lt,
+        TokenType.LESS_EQUAL: operator.le,
+    }
+    evaluators = {
+        Literal: visit_literal_expr,
+        Variable: look_up_variable,
+        Assign: visit_assign_expr,
+        Call: visit_call_expr,
+    }
+    call_evaluators = {
+        0: eval_call0,
+        1: eval_call1,
+        2: eval_call2,
+    }
+    unary_evaluators = {
+        TokenType.MINUS: eval_negate,
+        TokenType.BANG: eval_not,
+    }
+    logical_evaluators = {
+        TokenType.OR: eval_or,
+        TokenType.AND: eval_and,
+    }
+    logical_literal_evaluators = {
+        TokenType.OR: eval_or_literal,
+        TokenType.AND: eval_and_literal,
+    }
+    binary_evaluators = {
+        TokenType.MINUS: eval_subtract,
+        TokenType.PLUS: eval_add_first,
+        TokenType.SLASH: eval_divide,
+        TokenType.STAR: eval_multiply,
+        TokenType.GREATER: eval_greater,
+        TokenType.GREATER_EQUAL: eval_greater_equal,
+        TokenType.LESS: eval_less,
+        TokenType.LESS_EQUAL: eval_less_equal,
+        TokenType.BANG_EQUAL: eval_not_equal,
+        TokenType.EQUAL_EQUAL: eval_equal,
+    }
+
+    number_evaluators = {
+        TokenType.MINUS: eval_numbers_subtract,
+        TokenType.PLUS: eval_numbers_add,
+        TokenType.SLASH: eval_numbers_divide,
+        TokenType.STAR: eval_numbers_multiply,
+        TokenType.GREATER: eval_numbers_greater,
+        TokenType.GREATER_EQUAL: eval_numbers_greater_equal,
+        TokenType.LESS: eval_numbers_less,
+        TokenType.LESS_EQUAL: eval_numbers_less_equal,
+    }
+
+    def check_callable(self, paren: Token, callee: object, argument_count: int):
         if not isinstance(callee, LoxCallable):
-            raise RuntimeError(expr.paren, "Can only call functions and classes.")
-        if len(arguments) != callee.arity():
+            raise RuntimeError(paren, "Can only call functions and classes.")
+        if argument_count != callee.arity():
             raise RuntimeError(
-                expr.paren,
-                f"Expected {callee.arity()} arguments but got {len(arguments)}.",
+                paren,
+                f"Expected {callee.arity()} arguments but got {argument_count}.",
             )
-        return callee.call(self, arguments)
 
-    def check_number_operands(self, operator: Token, left: object, right: object):
-        if isinstance(left, float) and isinstance(right, float):
-            return
-        raise RuntimeError(operator, "Operands must be numbers.")
+    def raise_number_operands_error(self, expr: Binary):
+        if expr.op_type == TokenType.PLUS:
+            raise RuntimeError(
+                expr.operator, "Operands must be two numbers or two strings."
+            )
+        raise RuntimeError(expr.operator, "Operands must be numbers.")
+
+
+def is_number_literal(expr: Expr) -> bool:
+    return isinstance(expr, Literal) and expr.value.__class__ is float
+
 
-    def check_number_operand(self, operator: Token, operand: object):
-        if isinstance(operand, float):
-            return
-        raise RuntimeError(operator, "Operand must be a number.")
+def is_number_valued(expr: Expr) -> bool:
+    """
+    Whether evaluating the expression yields a number whenever it does not
+    raise. Arithmetic raises on anything but numbers, and + only accepts a
+    number alongside another number.
+    """
+    if isinstance(expr, Binary):
+        if expr.op_type in ARITHMETIC_TOKENS:
+            return True
+        return expr.op_type == TokenType.PLUS and (
+            is_number_valued(expr.left) or is_number_valued(expr.right)
+        )
+    if isinstance(expr, Unary):
+        return expr.op_type == TokenType.MINUS
+    if isinstance(expr, Variable):
+        return expr.declaration is not None and expr.declaration.number_valued
+    return is_number_literal(expr)
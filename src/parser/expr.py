@@ -1,66 +1,56 @@
-from dataclasses import dataclass
-from abc import ABC, abstractmethod
-from typing import List
-from scanner import Token
+from dataclasses import dataclass, field
+from typing import Callable, List
+from scanner import Token, TokenType
+
+
+def accept_visitor(interpreter: "Visitor", node):
+    """
+    Evaluate or execute through the visitor.
+    The interpreter replaces this per node with a specialized function.
+    """
+    return node.accept(interpreter)
 
 
 # Interfaces
-class Expr(ABC):
-    @abstractmethod
-    def accept(self, visitor: "Visitor"):
-        pass
+@dataclass(slots=True, eq=False)
+class Expr:
+    eval: Callable = field(default=accept_visitor, init=False, repr=False)
 
+    def accept(self, visitor: "Visitor"): ...
 
-class Visitor(ABC):
-    @abstractmethod
-    def visit_binary_expr(self, expr: "Binary"):
-        pass
 
-    @abstractmethod
-    def visit_grouping_expr(self, expr: "Grouping"):
-        pass
+class Visitor:
+    def visit_binary_expr(self, expr: "Binary"): ...
 
-    @abstractmethod
-    def visit_literal_expr(self, expr: "Literal"):
-        pass
+    def visit_literal_expr(self, expr: "Literal"): ...
 
-    @abstractmethod
-    def visit_unary_expr(self, expr: "Unary"):
-        pass
+    def visit_unary_expr(self, expr: "Unary"): ...
 
-    @abstractmethod
-    def visit_variable_expr(self, expr: "Variable"):
-        pass
+    def visit_variable_expr(self, expr: "Variable"): ...
 
-    @abstractmethod
-    def visit_assign_expr(self, expr: "Assign"):
-        pass
+    def visit_assign_expr(self, expr: "Assign"): ...
 
-    @abstractmethod
-    def visit_logical_expr(self, expr: "Logical"):
-        pass
+    def visit_logical_expr(self, expr: "Logical"): ...
 
 
 # Implementations
-@dataclass
+@dataclass(slots=True, eq=False)
 class Binary(Expr):
     left: Expr
     operator: Token
     right: Expr
+    op_type: TokenType = field(init=False, repr=False)
+    # Python operator used when one operand is known to be a number
+    number_operator: Callable = field(default=None, init=False, repr=False)
 
-    def accept(self, visitor: Visitor):
-        return visitor.visit_binary_expr(self)
-
-
-@dataclass
-class Grouping(Expr):
-    expression: Expr
+    def __post_init__(self):
+        self.op_type = self.operator.type
 
     def accept(self, visitor: Visitor):
-        return visitor.visit_grouping_expr(self)
+        return visitor.visit_binary_expr(self)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Literal(Expr):
     value: object
 
@@ -68,55 +58,69 @@ class Literal(Expr):
         return visitor.visit_literal_expr(self)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Unary(Expr):
     operator: Token
     right: Expr
+    op_type: TokenType = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.op_type = self.operator.type
 
     def accept(self, visitor: Visitor):
         return visitor.visit_unary_expr(self)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Variable(Expr):
     name: Token
+    # Where the resolver found the variable; depth -1 means it is a global
+    depth: int = field(default=-1, init=False, repr=False)
+    slot: int = field(default=0, init=False, repr=False)
+    # The Var that declared this local, if it was declared by one
+    declaration: object = field(default=None, init=False, repr=False)
+    # Inline cache for global lookups, valid while the globals version matches
+    cached_version: int = field(default=-1, init=False, repr=False)
+    cached_value: object = field(default=None, init=False, repr=False)
 
     def accept(self, visitor: Visitor):
         return visitor.visit_variable_expr(self)
 
-    def __hash__(self):
-        return hash(self.name)
-
-    def __eq__(self, other):
-        if isinstance(other, Variable):
-            return self.name == other.name
-        return False
 
-
-@dataclass
+@dataclass(slots=True, eq=False)
 class Assign(Expr):
     name: Token
     value: Expr
+    # Where the resolver found the variable; depth -1 means it is a global
+    depth: int = field(default=-1, init=False, repr=False)
+    slot: int = field(default=0, init=False, repr=False)
 
     def accept(self, visitor: Visitor):
         return visitor.visit_assign_expr(self)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Logical(Expr):
     left: Expr
     operator: Token
     right: Expr
+    op_type: TokenType = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.op_type = self.operator.type
 
     def accept(self, visitor: Visitor):
         return visitor.visit_logical_expr(self)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Call(Expr):
     callee: Expr
     paren: Token
     arguments: List[Expr]
+    # Set for calls to a global function that the program never reassigns
+    pinned: bool = field(default=False, init=False, repr=False)
+    resolved_callee: object = field(default=None, init=False, repr=False)
 
     def accept(self, visitor: Visitor):
         return visitor.visit_call_expr(self)
@@ -0,0 +1,51 @@
+import operator
+from scanner import Token, TokenType
+from parser.expr import Binary, Expr, Literal, Unary
+
+NUMBER_OPERATORS = {
+    TokenType.MINUS: operator.sub,
+    TokenType.PLUS: operator.add,
+    TokenType.SLASH: operator.truediv,
+    TokenType.STAR: operator.mul,
+    TokenType.GREATER: operator.gt,
+    TokenType.GREATER_EQUAL: operator.ge,
+    TokenType.LESS: operator.lt,
+    TokenType.LESS_EQUAL: operator.le,
+}
+
+EQUALITY_OPERATORS = {
+    TokenType.BANG_EQUAL: operator.ne,
+    TokenType.EQUAL_EQUAL: operator.eq,
+}
+
+
+def is_number(value: object) -> bool:
+    return value.__class__ is float
+
+
+def fold_binary(left: Expr, op: Token, right: Expr) -> Expr:
+    """
+    Build a binary expression, computing it now if both operands are literals.
+    Anything that would fail at runtime is left for the interpreter to report.
+    """
+    if isinstance(left, Literal) and isinstance(right, Literal):
+        a, b = left.value, right.value
+        if op.type in EQUALITY_OPERATORS:
+            return Literal(EQUALITY_OPERATORS[op.type](a, b))
+        if op.type == TokenType.PLUS and isinstance(a, str) and isinstance(b, str):
+            return Literal(a + b)
+        if op.type == TokenType.SLASH and b == 0:
+            return Binary(left, op, right)
+        if is_number(a) and is_number(b):
+            return Literal(NUMBER_OPERATORS[op.type](a, b))
+    return Binary(left, op, right)
+
+
+def fold_unary(op: Token, right: Expr) -> Expr:
+    """Build a unary expression, computing it now if the operand is a literal."""
+    if isinstance(right, Literal):
+        if op.type == TokenType.BANG:
+            return Literal(not right.value)
+        if is_number(right.value):
+            return Literal(-right.value)
+    return Unary(op, right)
@@ -2,9 +2,6 @@ from typing import List
 from scanner import Token, TokenType
 from parser.expr import (
     Expr,
-    Binary,
-    Grouping,
-    Unary,
     Literal,
     Variable,
     Assign,
@@ -13,6 +10,49 @@ from parser.expr import (
 )
 from parser.stmt import Return, Stmt, Print, Expression, Var, If, While, Block, Function
 from parser.error import ParseError
+from parser.fold import fold_binary, fold_unary
+
+# Binding power of each binary and logical operator; higher binds tighter
+BINARY_PRECEDENCE = {
+    TokenType.OR: 1,
+    TokenType.AND: 2,
+    TokenType.BANG_EQUAL: 3,
+    TokenType.EQUAL_EQUAL: 3,
+    TokenType.GREATER: 4,
+    TokenType.GREATER_EQUAL: 4,
+    TokenType.LESS: 4,
+    TokenType.LESS_EQUAL: 4,
+    TokenType.MINUS: 5,
+    TokenType.PLUS: 5,
+    TokenType.SLASH: 6,
+    TokenType.STAR: 6,
+}
+LOGICAL_TOKENS = frozenset((TokenType.OR, TokenType.AND))
+UNARY_TOKENS = frozenset((TokenType.BANG, TokenType.MINUS))
+LITERAL_TOKENS = frozenset((TokenType.NUMBER, TokenType.STRING))
+# Tokens that begin a statement, where error recovery can resume
+STATEMENT_START_TOKENS = frozenset(
+    (
+        TokenType.CLASS,
+        TokenType.FUN,
+        TokenType.VAR,
+        TokenType.FOR,
+        TokenType.IF,
+        TokenType.WHILE,
+        TokenType.PRINT,
+        TokenType.RETURN,
+    )
+)
+
+# Literal nodes carry no per-node state, so these are shared by every use
+LITERAL_FALSE = Literal(False)
+LITERAL_TRUE = Literal(True)
+LITERAL_NIL = Literal(None)
+CONSTANT_LITERALS = {
+    TokenType.FALSE: LITERAL_FALSE,
+    TokenType.TRUE: LITERAL_TRUE,
+    TokenType.NIL: LITERAL_NIL,
+}
 
 
 class Parser:
@@ -22,6 +62,8 @@ class Parser:
     def __init__(self, pylox, tokens: List[Token]):
         self.pylox = pylox
         self.tokens = tokens
+        # Token types in their own list, so checks skip loading each Token
+        self.types: List[TokenType] = [token.type for token in tokens]
 
     def parse(self):
         statements: List[Stmt] = []
@@ -34,36 +76,20 @@ class Parser:
         return self.assignment()
 
     def assignment(self):
-        expr = self._or()
-        if self.match(TokenType.EQUAL):
-            equals = self.previous()
+        expr = self.binary()
+        tokens = self.tokens
+        if self.types[self.current] is TokenType.EQUAL:
+            equals = tokens[self.current]
+            # A parenthesized name ends in ')' rather than the name itself
+            target = tokens[self.current - 1]
+            self.current += 1
             value = self.assignment()
-            if isinstance(expr, Variable):
+            if isinstance(expr, Variable) and expr.name is target:
                 name = expr.name
                 return Assign(name, value)
             self.error(equals, "Invalid assignment target.")
         return expr
 
-    def _or(self):
-        expr = self._and()
-
-        while self.match(TokenType.OR):
-            operator = self.previous()
-            right = self._and()
-            expr = Logical(expr, operator, right)
-
-        return expr
-
-    def _and(self):
-        expr = self.equality()
-
-        while self.match(TokenType.AND):
-            operator = self.previous()
-            right = self.equality()
-            expr = Logical(expr, operator, right)
-
-        return expr
-
     def declaration(self):
         try:
             if self.match(TokenType.VAR):
@@ -76,20 +102,14 @@ class Parser:
             return None
 
     def statement(self):
-        if self.match(TokenType.PRINT):
-            return self.print_statement()
-        elif self.match(TokenType.LEFT_BRACE):
-            return Block(self.block())
-        elif self.match(TokenType.IF):
-            return self.if_statement()
-        elif self.match(TokenType.WHILE):
-            return self.while_statement()
-        elif self.match(TokenType.FOR):
-            return self.for_statement()
-        elif self.match(TokenType.RETURN):
-            return self.return_statement()
-        else:
+        parse = self.statement_parsers.get(self.types[self.current])
+        if parse is None:
             return self.expression_statement()
+        self.current += 1
+        return parse(self)
+
+    def block_statement(self):
+        return Block(self.block())
 
     def for_statement(self):
         self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'for'.")
@@ -113,12 +133,12 @@ class Parser:
 
         body = self.statement()
         if increment:
-            body = Block([body, Expression(increment)])
+            body = Block((body, Expression(increment)))
         if not condition:
-            condition = Literal(True)
+            condition = LITERAL_TRUE
         body = While(condition, body)
         if initializer:
-            body = Block([initializer, body])
+            body = Block((initializer, body))
         return body
 
     def if_statement(self):
@@ -191,29 +211,17 @@ class Parser:
         while not self.check(TokenType.RIGHT_BRACE) and not self.is_at_end():
             statements.append(self.declaration())
         self.consume(TokenType.RIGHT_BRACE, "Expect '}' after block.")
-        return statements
-
-    def equality(self):
-        expr = self.comparison()
+        return tuple(statements)
 
-        while self.match(TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL):
-            operator = self.previous()
-            right = self.comparison()
-            expr = Binary(expr, operator, right)
-
-        return expr
-
-    def match(self, *types: TokenType):
-        for t in types:
-            if self.check(t):
-                self.advance()
-                return True
+    def match(self, type: TokenType):
+        # EOF is never matched, so the end of input needs no separate check
+        if self.types[self.current] is type:
+            self.current += 1
+            return True
         return False
 
     def check(self, type: TokenType):
-        if self.is_at_end():
-            return False
-        return self.peek().type == type
+        return self.types[self.current] is type
 
     def advance(self):
         if not self.is_at_end():
@@ -221,7 +229,7 @@ class Parser:
         return self.previous()
 
     def is_at_end(self):
-        return self.peek().type == TokenType.EOF
+        return self.types[self.current] is TokenType.EOF
 
     def peek(self):
         return self.tokens[self.current]
@@ -229,46 +237,34 @@ class Parser:
     def previous(self):
         return self.tokens[self.current - 1]
 
-    def comparison(self):
-        expr = self.term()
-
-        while self.match(
-            TokenType.GREATER,
-            TokenType.GREATER_EQUAL,
-            TokenType.LESS,
-            TokenType.LESS_EQUAL,
-        ):
-            operator = self.previous()
-            right = self.term()
-            expr = Binary(expr, operator, right)
-
-        return expr
-
-    def term(self):
-        expr = self.factor()
-
-        while self.match(TokenType.MINUS, TokenType.PLUS):
-            operator = self.previous()
-            right = self.factor()
-            expr = Binary(expr, operator, right)
-
-        return expr
-
-    def factor(self):
+    def binary(self, min_precedence: int = 1):
+        """
+        Parse logic_or down to factor by precedence climbing.
+        The right operand only takes operators that bind tighter, which keeps
+        every level left-associative.
+        """
         expr = self.unary()
+        tokens, types = self.tokens, self.types
 
-        while self.match(TokenType.SLASH, TokenType.STAR):
-            operator = self.previous()
-            right = self.unary()
-            expr = Binary(expr, operator, right)
-
-        return expr
+        while True:
+            precedence = BINARY_PRECEDENCE.get(types[self.current], 0)
+            if precedence < min_precedence:
+                return expr
+            operator = tokens[self.current]
+            self.current += 1
+            right = self.binary(precedence + 1)
+            if operator.type in LOGICAL_TOKENS:
+                expr = Logical(expr, operator, right)
+            else:
+                expr = fold_binary(expr, operator, right)
 
     def unary(self):
-        if self.match(TokenType.BANG, TokenType.MINUS):
-            operator = self.previous()
+        current = self.current
+        if self.types[current] in UNARY_TOKENS:
+            operator = self.tokens[current]
+            self.current = current + 1
             right = self.unary()
-            return Unary(operator, right)
+            return fold_unary(operator, right)
         return self.call()
 
     def finish_call(self, callee):
@@ -284,31 +280,33 @@ class Parser:
 
     def call(self):
         expr = self.primary()
+        types = self.types
 
-        while True:
-            if self.match(TokenType.LEFT_PAREN):
-                expr = self.finish_call(expr)
-            else:
-                break
+        while types[self.current] is TokenType.LEFT_PAREN:
+            self.current += 1
+            expr = self.finish_call(expr)
 
         return expr
 
     def primary(self):
-        if self.match(TokenType.FALSE):
-            return Literal(False)
-        if self.match(TokenType.TRUE):
-            return Literal(True)
-        if self.match(TokenType.NIL):
-            return Literal(None)
-        if self.match(TokenType.NUMBER, TokenType.STRING):
-            return Literal(self.previous().literal)
-        if self.match(TokenType.IDENTIFIER):
-            return Variable(self.previous())
-        if self.match(TokenType.LEFT_PAREN):
+        token = self.tokens[self.current]
+        token_type = token.type
+        if token_type is TokenType.IDENTIFIER:
+            self.current += 1
+            return Variable(token)
+        if token_type in LITERAL_TOKENS:
+            self.current += 1
+            return Literal(token.literal)
+        if token_type in CONSTANT_LITERALS:
+            self.current += 1
+            return CONSTANT_LITERALS[token_type]
+        if token_type is TokenType.LEFT_PAREN:
+            self.current += 1
             expr = self.expression()
             self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
-            return Grouping(expr)
-        raise self.error(self.peek(), "Expect expression.")
+            # Parentheses only steer parsing, so no node is kept for them
+            return expr
+        raise self.error(token, "Expect expression.")
 
     def consume(self, type: TokenType, message: str):
         if self.check(type):
@@ -322,17 +320,19 @@ class Parser:
     def synchronize(self):
         self.advance()
         while not self.is_at_end():
-            if self.previous().type == TokenType.SEMICOLON:
+            if self.types[self.current - 1] is TokenType.SEMICOLON:
                 return
-            if self.peek().type in [
-                TokenType.CLASS,
-                TokenType.FUN,
-                TokenType.VAR,
-                TokenType.FOR,
-                TokenType.IF,
-                TokenType.WHILE,
-                TokenType.PRINT,
-                TokenType.RETURN,
-            ]:
+            if self.types[self.current] in STATEMENT_START_TOKENS:
                 return
             self.advance()
+
+    # Keyed by the keyword or brace that starts the statement, which the
+    # parser consumes before calling in
+    statement_parsers = {
+        TokenType.PRINT: print_statement,
+        TokenType.LEFT_BRACE: block_statement,
+        TokenType.IF: if_statement,
+        TokenType.WHILE: while_statement,
+        TokenType.FOR: for_statement,
+        TokenType.RETURN: return_statement,
+    }
@@ -1,53 +1,37 @@
-from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import List
-from parser.expr import Expr
+from dataclasses import dataclass, field
+from typing import Callable, List, Tuple
+from parser.expr import Expr, accept_visitor
 from scanner import Token
 
 
 # Interfaces
-class Stmt(ABC):
-    @abstractmethod
-    def accept(self, visitor: "Visitor"):
-        pass
+@dataclass(slots=True, eq=False)
+class Stmt:
+    execute: Callable = field(default=accept_visitor, init=False, repr=False)
 
+    def accept(self, visitor: "Visitor"): ...
 
-class Visitor(ABC):
-    @abstractmethod
-    def visit_expression_stmt(self, stmt: "Expression"):
-        pass
 
-    @abstractmethod
-    def visit_print_stmt(self, stmt: "Print"):
-        pass
+class Visitor:
+    def visit_expression_stmt(self, stmt: "Expression"): ...
 
-    @abstractmethod
-    def visit_var_stmt(self, stmt: "Var"):
-        pass
+    def visit_print_stmt(self, stmt: "Print"): ...
 
-    @abstractmethod
-    def visit_block_stmt(self, stmt: "Block"):
-        pass
+    def visit_var_stmt(self, stmt: "Var"): ...
 
-    @abstractmethod
-    def visit_if_stmt(self, stmt: "If"):
-        pass
+    def visit_block_stmt(self, stmt: "Block"): ...
 
-    @abstractmethod
-    def visit_while_stmt(self, stmt: "While"):
-        pass
+    def visit_if_stmt(self, stmt: "If"): ...
 
-    @abstractmethod
-    def visit_function_stmt(self, stmt: "Function"):
-        pass
+    def visit_while_stmt(self, stmt: "While"): ...
 
-    @abstractmethod
-    def visit_return_stmt(self, stmt: "Return"):
-        pass
+    def visit_function_stmt(self, stmt: "Function"): ...
+
+    def visit_return_stmt(self, stmt: "Return"): ...
 
 
 # Implementations
-@dataclass
+@dataclass(slots=True, eq=False)
 class Expression(Stmt):
     expression: Expr
 
@@ -55,7 +39,7 @@ class Expression(Stmt):
         return visitor.visit_expression_stmt(self)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Print(Stmt):
     expression: Expr
 
@@ -63,24 +47,34 @@ class Print(Stmt):
         return visitor.visit_print_stmt(self)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Var(Stmt):
     name: Token
     initializer: Expr
+    # Where the resolver found the declaration; depth -1 means it is a global
+    depth: int = field(default=-1, init=False, repr=False)
+    slot: int = field(default=0, init=False, repr=False)
+    # Set when every value this local is ever given is a number
+    number_valued: bool = field(default=False, init=False, repr=False)
 
     def accept(self, visitor: Visitor):
         return visitor.visit_var_stmt(self)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Block(Stmt):
-    statements: list[Stmt]
+    statements: Tuple[Stmt, ...]
+    n_locals: int = 0
+    # Set by the resolver when a function declared inside may capture the frame
+    captures_environment: bool = False
+    # Environments left behind by earlier runs, reused when none is captured
+    pool: List[object] = field(default_factory=list, init=False, repr=False)
 
     def accept(self, visitor: Visitor):
         return visitor.visit_block_stmt(self)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class If(Stmt):
     condition: Expr
     then_branch: Stmt
@@ -90,7 +84,7 @@ class If(Stmt):
         return visitor.visit_if_stmt(self)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class While(Stmt):
     condition: Expr
     body: Stmt
@@ -99,17 +93,23 @@ class While(Stmt):
         return visitor.visit_while_stmt(self)
 
 
-@dataclass
-class Function(Expr):
+@dataclass(slots=True, eq=False)
+class Function(Stmt):
     name: Token
     params: List[Token]
-    body: List[Stmt]
+    body: Tuple[Stmt, ...]
+    n_locals: int = 0
+    # Set by the resolver when a function declared inside may capture the frame
+    captures_environment: bool = False
+    # Where the resolver found the declaration; depth -1 means it is a global
+    depth: int = field(default=-1, init=False, repr=False)
+    slot: int = field(default=0, init=False, repr=False)
 
     def accept(self, visitor: Visitor):
         return visitor.visit_function_stmt(self)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Return(Stmt):
     keyword: Token
     value: Expr
@@ -1,10 +1,9 @@
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from scanner import Token
 from parser.expr import (
     Call,
     Expr,
     Binary,
-    Grouping,
     Unary,
     Literal,
     Assign,
@@ -35,77 +34,123 @@ class FunctionType(Enum):
 class Resolver(ExprVisitor, StmtVisitor):
     """
     Visit all nodes int the AST and resolve all variable references.
-    Resolving means finding the depth of the scope in which the variable is declared.
+    Resolving means finding the depth of the scope in which the variable is declared,
+    and the slot it occupies within that scope.
     This prevents dynamic scoping overwriting variables in outer scopes.
     """
 
     def __init__(self, interpreter):
         self.interpreter = interpreter
-        self.scopes = []
+        # Each local scope maps a declared name to its slot and declaring Var
+        self.scopes: List[Dict[str, Tuple[int, Optional[Var]]]] = []
+        # The local whose initializer is being resolved, if any
+        self.initializing: Optional[str] = None
         self.current_function = FunctionType.NONE
+        self.function_stack: List[Function] = []
+        self.block_stack: List[Block] = []
+        self.global_calls: List[Call] = []
+        self.assigned_globals = set()
+        # Every value given to a local Var, and the operators in local scopes
+        self.local_values: List[Tuple[Var, Expr]] = []
+        self.local_binaries: List[Binary] = []
 
     def resolve(self, statements: List[Stmt]):
         for statement in statements:
             self.resolve_stmt(statement)
+        if not self.scopes:
+            # The whole program has been seen, so we know which globals it assigns
+            self.pin_global_calls()
+            self.specialize_number_locals()
+
+    def pin_global_calls(self):
+        for call in self.global_calls:
+            if call.callee.name.lexeme not in self.assigned_globals:
+                self.interpreter.pin(call)
+        self.global_calls.clear()
+
+    def specialize_number_locals(self):
+        """Respecialize operators now that the number-only locals are known."""
+        self.interpreter.infer_number_locals(self.local_values)
+        for binary in self.local_binaries:
+            self.interpreter.specialize(binary)
+        self.local_values.clear()
+        self.local_binaries.clear()
 
     def resolve_function(self, function: Function, type: FunctionType):
         enclosing_function = self.current_function
         self.current_function = type
+        for enclosing in self.function_stack:
+            enclosing.captures_environment = True
+        for block in self.block_stack:
+            block.captures_environment = True
+        self.function_stack.append(function)
         self.begin_scope()
         for param in function.params:
             self.declare(param)
-            self.define(param)
         self.resolve(function.body)
-        self.end_scope()
+        function.n_locals = self.end_scope()
+        self.function_stack.pop()
         self.current_function = enclosing_function
 
     def begin_scope(self):
         self.scopes.append({})
 
-    def end_scope(self):
-        self.scopes.pop()
+    def end_scope(self) -> int:
+        """Close the innermost scope and return how many slots it needs."""
+        return len(self.scopes.pop())
 
-    def declare(self, name: Token):
+    def declare(self, name: Token, declaration: Optional[Var] = None):
         if not self.scopes:
             return
 
         scope = self.scopes[-1]
         if name.lexeme in scope:
-            self.interpreter.error(
+            self.interpreter.pylox.resolver_error(
                 name, "Variable with this name already declared in this scope."
             )
 
-        scope[name.lexeme] = False
-
-    def define(self, name: Token):
-        if not self.scopes:
-            return
+        scope.setdefault(name.lexeme, (len(scope), declaration))
 
-        self.scopes[-1][name.lexeme] = True
+    def is_global(self, name: Token) -> bool:
+        return not any(name.lexeme in scope for scope in self.scopes)
 
-    def resolve_local(self, expr: Variable, name: Token):
-        for i in range(len(self.scopes) - 1, -1, -1):
-            if name.lexeme in self.scopes[i]:
-                self.interpreter.resolve(expr, len(self.scopes) - 1 - i)
-                return
+    def resolve_local(self, expr: Variable, name: Token) -> Optional[Var]:
+        """Resolve a local and return the Var that declared it, if any."""
+        scopes = self.scopes
+        for i in range(len(scopes) - 1, -1, -1):
+            local = scopes[i].get(name.lexeme)
+            if local is not None:
+                slot, declaration = local
+                self.interpreter.resolve(expr, len(scopes) - 1 - i, slot)
+                return declaration
+        return None
 
     def resolve_stmt(self, stmt: Stmt):
-        stmt.accept(self)
+        self.stmt_resolvers[stmt.__class__](self, stmt)
+        self.interpreter.specialize_stmt(stmt)
 
     def resolve_expr(self, expr: Expr):
-        expr.accept(self)
+        self.expr_resolvers[expr.__class__](self, expr)
+        self.interpreter.specialize(expr)
 
     def visit_block_stmt(self, stmt: Block):
+        if not any(isinstance(s, (Var, Function)) for s in stmt.statements):
+            # Nothing is declared, so the block shares the enclosing scope
+            for statement in stmt.statements:
+                self.resolve_stmt(statement)
+            return
+        self.block_stack.append(stmt)
         self.begin_scope()
         self.resolve(stmt.statements)
-        self.end_scope()
+        stmt.n_locals = self.end_scope()
+        self.block_stack.pop()
 
     def visit_expression_stmt(self, stmt: Expression):
         self.resolve_expr(stmt.expression)
 
     def visit_function_stmt(self, stmt: Function):
         self.declare(stmt.name)
-        self.define(stmt.name)
+        self.resolve_local(stmt, stmt.name)
         self.resolve_function(stmt, FunctionType.FUNCTION)
 
     def visit_if_stmt(self, stmt: If):
@@ -119,15 +164,23 @@ class Resolver(ExprVisitor, StmtVisitor):
 
     def visit_return_stmt(self, stmt: Return):
         if self.current_function == FunctionType.NONE:
-            self.interpreter.error(stmt.keyword, "Cannot return from top-level code.")
+            self.interpreter.pylox.resolver_error(
+                stmt.keyword, "Cannot return from top-level code."
+            )
         if stmt.value is not None:
             self.resolve_expr(stmt.value)
 
     def visit_var_stmt(self, stmt: Var):
-        self.declare(stmt.name)
+        self.declare(stmt.name, stmt)
+        if self.scopes:
+            self.local_values.append((stmt, stmt.initializer))
         if stmt.initializer is not None:
+            # Expressions open no scopes, so only this one name can be pending
+            if self.scopes:
+                self.initializing = stmt.name.lexeme
             self.resolve_expr(stmt.initializer)
-        self.define(stmt.name)
+            self.initializing = None
+        self.resolve_local(stmt, stmt.name)
 
     def visit_while_stmt(self, stmt: While):
         self.resolve_expr(stmt.condition)
@@ -135,20 +188,25 @@ class Resolver(ExprVisitor, StmtVisitor):
 
     def visit_assign_expr(self, expr: Assign):
         self.resolve_expr(expr.value)
-        self.resolve_local(expr, expr.name)
+        declaration = self.resolve_local(expr, expr.name)
+        if declaration is not None:
+            self.local_values.append((declaration, expr.value))
+        if self.is_global(expr.name):
+            self.assigned_globals.add(expr.name.lexeme)
 
     def visit_binary_expr(self, expr: Binary):
         self.resolve_expr(expr.left)
         self.resolve_expr(expr.right)
+        if self.scopes:
+            self.local_binaries.append(expr)
 
     def visit_call_expr(self, expr: Call):
         self.resolve_expr(expr.callee)
+        if isinstance(expr.callee, Variable) and self.is_global(expr.callee.name):
+            self.global_calls.append(expr)
         for argument in expr.arguments:
             self.resolve_expr(argument)
 
-    def visit_grouping_expr(self, expr: Grouping):
-        self.resolve_expr(expr.expression)
-
     def visit_literal_expr(self, expr: Literal):
         pass
 
@@ -160,8 +218,29 @@ class Resolver(ExprVisitor, StmtVisitor):
         self.resolve_expr(expr.right)
 
     def visit_variable_expr(self, expr: Variable):
-        if self.scopes and self.scopes[-1].get(expr.name.lexeme) is False:
+        if expr.name.lexeme == self.initializing:
             self.interpreter.pylox.resolver_error(
                 expr.name, "Cannot read local variable in its own initializer."
             )
-        self.resolve_local(expr, expr.name)
+        expr.declaration = self.resolve_local(expr, expr.name)
+
+    # Keyed by node class, so resolving a node skips the accept indirection
+    stmt_resolvers = {
+        Block: visit_block_stmt,
+        Expression: visit_expression_stmt,
+        Function: visit_function_stmt,
+        If: visit_if_stmt,
+        Print: visit_print_stmt,
+        Return: visit_return_stmt,
+        Var: visit_var_stmt,
+        While: visit_while_stmt,
+    }
+    expr_resolvers = {
+        Assign: visit_assign_expr,
+        Binary: visit_binary_expr,
+        Call: visit_call_expr,
+        Literal: visit_literal_expr,
+        Logical: visit_logical_expr,
+        Unary: visit_unary_expr,
+        Variable: visit_variable_expr,
+    }
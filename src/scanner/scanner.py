@@ -1,147 +1,95 @@
+import re
+from sys import intern
 from typing import List
 from scanner.token import Token, TokenType, KEYWORD_MAP
 
+# One alternation over every lexeme, so the per-character work runs inside re.
+# Blanks before a lexeme are consumed by the same match rather than their own.
+# END gives blanks at the end of the source a match of their own too, so the
+# blank prefix never backtracks looking for a lexeme that is not there.
+TOKEN_PATTERN = re.compile(
+    r"""
+    [ \r\t]*
+    (?:
+    (?P<NEWLINE>\n)
+    | (?P<IDENTIFIER>[^\W\d_][^\W_]*)
+    | (?P<NUMBER>\d+(?:\.\d+)?)
+    | (?P<COMMENT>//[^\n]*)
+    | (?P<OPERATOR>[!=<>]=?|[(){},.\-+;*/])
+    | (?P<STRING>"[^"]*")
+    | (?P<UNTERMINATED>"[^"]*)
+    | (?P<ERROR>[^ \r\t])
+    | (?P<END>\Z)
+    )
+    """,
+    re.VERBOSE,
+)
+
+OPERATORS = {
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    "-": TokenType.MINUS,
+    "+": TokenType.PLUS,
+    ";": TokenType.SEMICOLON,
+    "*": TokenType.STAR,
+    "/": TokenType.SLASH,
+    "!": TokenType.BANG,
+    "!=": TokenType.BANG_EQUAL,
+    "=": TokenType.EQUAL,
+    "==": TokenType.EQUAL_EQUAL,
+    "<": TokenType.LESS,
+    "<=": TokenType.LESS_EQUAL,
+    ">": TokenType.GREATER,
+    ">=": TokenType.GREATER_EQUAL,
+}
+
 
 class Scanner:
     def __init__(self, pylox, source: str):
         self.pylox = pylox
         self.source = source
         self.tokens: List[Token] = []
-        self.start: int = 0
-        self.current: int = 0
         self.line: int = 1
 
     def scan_tokens(self) -> List[Token]:
-        while not self.is_at_end():
-            self.start = self.current
-            self.scan_token()
-        self.tokens.append(Token(TokenType.EOF, "", None, self.line))
-        return self.tokens
-
-    def is_at_end(self) -> bool:
-        return self.current >= len(self.source)
-
-    def scan_token(self) -> None:
-        c: str = self.advance()
-        match c:
-            case "(":
-                self.add_token(TokenType.LEFT_PAREN)
-            case ")":
-                self.add_token(TokenType.RIGHT_PAREN)
-            case "{":
-                self.add_token(TokenType.LEFT_BRACE)
-            case "}":
-                self.add_token(TokenType.RIGHT_BRACE)
-            case ",":
-                self.add_token(TokenType.COMMA)
-            case ".":
-                self.add_token(TokenType.DOT)
-            case "-":
-                self.add_token(TokenType.MINUS)
-            case "+":
-                self.add_token(TokenType.PLUS)
-            case ";":
-                self.add_token(TokenType.SEMICOLON)
-            case "*":
-                self.add_token(TokenType.STAR)
-            case "!":
-                self.add_token(
-                    TokenType.BANG_EQUAL if self.match("=") else TokenType.BANG
-                )
-            case "=":
-                self.add_token(
-                    TokenType.EQUAL_EQUAL if self.match("=") else TokenType.EQUAL
-                )
-            case "<":
-                self.add_token(
-                    TokenType.LESS_EQUAL if self.match("=") else TokenType.LESS
-                )
-            case ">":
-                self.add_token(
-                    TokenType.GREATER_EQUAL if self.match("=") else TokenType.GREATER
-                )
-            case "/":
-                if self.match("/"):
-                    while self.peek() and self.peek() != "\n":
-                        self.advance()
-                else:
-                    self.add_token(TokenType.SLASH)
-            case " " | "\r" | "\t":
-                pass
-            case "\n":
-                self.line += 1
-            case '"':
-                self.string()
-            case _:
-                if c.isdigit():
-                    self.number()
-                elif c.isalpha():
-                    self.identifier()
-                else:
-                    self.pylox.scanner_error(self.line, f"Unexpected character {c}")
-        return
-
-    def add_token(self, token_type: TokenType, literal: object = None) -> None:
-        text: str = self.source[self.start : self.current]
-        self.tokens.append(Token(token_type, text, literal, self.line))
-
-    def string(self) -> None:
-        while self.peek() and self.peek() != '"':
-            if self.peek() == "\n":
-                self.line += 1
-            self.advance()
-
-        if self.is_at_end():
-            print(f"[Line: {self.line}] Error: Unterminated string.")
-            return
-
-        self.advance()
-
-        value = self.source[self.start + 1 : self.current - 1]
-        self.add_token(TokenType.STRING, value)
-
-    def number(self) -> None:
-        while self.peek() and self.peek().isdigit():
-            self.advance()
-
-        if self.peek() == "." and self.peek_next().isdigit():
-            self.advance()
-
-            while self.peek() and self.peek().isdigit():
-                self.advance()
-
-        self.add_token(TokenType.NUMBER, float(self.source[self.start : self.current]))
-
-    def identifier(self) -> None:
-        while self.peek() and self.peek().isalnum():
-            self.advance()
-
-        text = self.source[self.start : self.current]
-        token_type = KEYWORD_MAP[text] if text in KEYWORD_MAP else TokenType.IDENTIFIER
-        self.add_token(token_type)
-
-    def advance(self) -> str:
-        """Always advance cursor"""
-        self.current += 1
-        return self.source[self.current - 1]
-
-    def match(self, expected: str) -> bool:
-        """Only advance cursor if match"""
-        if self.is_at_end():
-            return False
-        if self.source[self.current] != expected:
-            return False
-        self.current += 1
-        return True
-
-    def peek(self) -> str | None:
-        """Never advance cursor"""
-        if self.is_at_end():
-            return None
-        return self.source[self.current]
-
-    def peek_next(self) -> str | None:
-        """Never advance cursor"""
-        if self.current + 1 >= len(self.source):
-            return None
-        return self.source[self.current + 1]
+        tokens = self.tokens
+        line = self.line
+        # Loop-invariant lookups kept in locals
+        append = tokens.append
+        keyword_type = KEYWORD_MAP.get
+        operators = OPERATORS
+        IDENTIFIER = TokenType.IDENTIFIER
+        NUMBER = TokenType.NUMBER
+        STRING = TokenType.STRING
+        for match in TOKEN_PATTERN.finditer(self.source):
+            kind = match.lastgroup
+            if kind == "COMMENT":
+                continue
+            text = match.group(kind)
+            if kind == "IDENTIFIER":
+                # Interned so that environment and scope lookups compare names
+                # by identity
+                text = intern(text)
+                token_type = keyword_type(text, IDENTIFIER)
+                append(Token(token_type, text, None, line))
+            elif kind == "OPERATOR":
+                append(Token(operators[text], text, None, line))
+            elif kind == "NEWLINE":
+                line += 1
+            elif kind == "NUMBER":
+                append(Token(NUMBER, text, float(text), line))
+            elif kind == "STRING":
+                line += text.count("\n")
+                append(Token(STRING, text, text[1:-1], line))
+            elif kind == "UNTERMINATED":
+                line += text.count("\n")
+                print(f"[Line: {line}] Error: Unterminated string.")
+            elif kind == "ERROR":
+                self.pylox.scanner_error(line, f"Unexpected character {text}")
+        self.line = line
+        tokens.append(Token(TokenType.EOF, "", None, line))
+        return tokens
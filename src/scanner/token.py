@@ -1,8 +1,9 @@
-from enum import Enum, auto
+from enum import IntEnum, auto
 from dataclasses import dataclass
 
 
-class TokenType(Enum):
+# An IntEnum so that hashing and comparing token types stays in C
+class TokenType(IntEnum):
     # Single-character tokens
     LEFT_PAREN = auto()
     RIGHT_PAREN = auto()
@@ -77,7 +78,7 @@ KEYWORD_MAP = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     type: TokenType
     lexeme: str
@@ -85,7 +86,7 @@ class Token:
     line: int
 
     def __str__(self):
-        return f"{self.type:20} {self.lexeme:10} {self.literal}"
+        return f"{self.type.name:20} {self.lexeme:10} {self.literal}"
 
     def __hash__(self):
         return hash((self.type, self.lexeme, self.literal, self.line))
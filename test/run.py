@@ -0,0 +1,76 @@
+"""
+Run every Lox program under test/ and compare what it prints with the
+`// expect: <line>` comments it contains, in order.
+A program that should stop with a runtime error marks the failing line with
+`// expect runtime error: <message>`; it must then exit with status 70.
+Usage: python3 test/run.py
+"""
+
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+TEST_DIR = Path(__file__).resolve().parent
+MAIN = TEST_DIR.parent / "src" / "main.py"
+EXPECT_PATTERN = re.compile(r"// expect: ?(.*)")
+RUNTIME_ERROR_PATTERN = re.compile(r"// expect runtime error: (.*)")
+# Seconds a program may run before it counts as hung
+TIMEOUT = 60
+
+
+def expected_run(path: Path) -> Tuple[List[str], int]:
+    """The output a program should print and the status it should exit with."""
+    output: List[str] = []
+    status = 0
+    for number, line in enumerate(path.read_text().splitlines(), 1):
+        match = EXPECT_PATTERN.search(line)
+        if match:
+            output.append(match.group(1))
+            continue
+        match = RUNTIME_ERROR_PATTERN.search(line)
+        if match:
+            output += [match.group(1), f"[line {number}]"]
+            status = 70
+    return output, status
+
+
+def run_test(path: Path) -> bool:
+    try:
+        result = subprocess.run(
+            [sys.executable, str(MAIN), str(path)],
+            capture_output=True,
+            text=True,
+            timeout=TIMEOUT,
+        )
+    except subprocess.TimeoutExpired:
+        print(f"FAIL {path.relative_to(TEST_DIR)}")
+        print(f"  still running after {TIMEOUT}s")
+        return False
+    expected, status = expected_run(path)
+    actual = result.stdout.splitlines()
+    if result.returncode == status and actual == expected:
+        return True
+    print(f"FAIL {path.relative_to(TEST_DIR)}")
+    if result.returncode != status:
+        print(f"  exit code {result.returncode}, expected {status}")
+    for i in range(max(len(expected), len(actual))):
+        want = expected[i] if i < len(expected) else "<nothing>"
+        got = actual[i] if i < len(actual) else "<nothing>"
+        if want != got:
+            print(f"  line {i + 1}: expected {want!r}, got {got!r}")
+    if result.stderr:
+        print(result.stderr.rstrip())
+    return False
+
+
+def main() -> int:
+    paths = sorted(TEST_DIR.rglob("*.lox"))
+    failed = [path for path in paths if not run_test(path)]
+    print(f"{len(paths) - len(failed)} passed, {len(failed)} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())